@@ -5,83 +5,106 @@ Alfred 密码管理工具
 """
 
 import sys
+import atexit
 import sqlite3
-import random
-import string
 import os
 import time
-import json
+import marshal
 
-# 尝试导入 pyperclip，如果失败则使用备用方案
+# 优先使用 orjson 序列化 JSON，不可用时退回标准库 json
 try:
-    import pyperclip
-    CLIPBOARD_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    CLIPBOARD_AVAILABLE = False
-    # 不在 Alfred 中输出警告到 stderr，避免干扰
-    pass
+    import json
+    ORJSON_AVAILABLE = False
 
 # 数据库路径
 DB_PATH = os.path.join(os.path.dirname(__file__), "passwords.db")
 
+# 进程内共享的数据库连接，由 get_conn() 懒加载
+_CONN = None
+
+# 输出缓存：按 (查询, 数据库文件状态) 缓存 Alfred 的 JSON 输出
+CACHE_PATH = DB_PATH + ".cache"
+CACHE_MAX_ENTRIES = 64
+# 本次调用的缓存键，为 None 时不写入缓存
+_CACHE_KEY = None
+
+# 系统消息（删除成功、清空完成等），作为查询传回时直接显示帮助
+SYSTEM_MESSAGES = frozenset(["✅ 删除成功", "删除成功", "删除失败", "✅ 清空完成", "清空完成", "清空失败"])
+# 帮助项中的 emoji 标记；"⚠️" 由 U+26A0 和变体选择符 U+FE0F 两个码位组成，单独按子串匹配
+HELP_EMOJI_MARKERS = frozenset("🔐🔑📋")
+HELP_WARNING_MARKER = "⚠️"
+# 操作结果中的 emoji 标记
+RESULT_EMOJI_MARKERS = frozenset("✅❌")
+
+# 数据库结构版本，记录在 PRAGMA user_version 中，低于此版本时执行 init_db 升级
+SCHEMA_VERSION = 1
+
+# SQL 语句常量，保持文本一致以命中连接上的预编译语句缓存
+SQL_CREATE = '''
+    CREATE TABLE IF NOT EXISTS passwords (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE,
+        password TEXT,
+        created_at TIMESTAMP
+    )
+'''
+SQL_CREATE_INDEX = "CREATE INDEX IF NOT EXISTS idx_pw_created ON passwords(created_at DESC)"
+SQL_INSERT = "INSERT OR REPLACE INTO passwords (name, password, created_at) VALUES (?, ?, ?)"
+SQL_SELECT_ONE = "SELECT password FROM passwords WHERE name=?"
+SQL_LIST_FULL = "SELECT name, password FROM passwords ORDER BY created_at DESC"
+SQL_LIST_RECENT = "SELECT name, password FROM passwords ORDER BY created_at DESC LIMIT ?"
+SQL_COUNT = "SELECT COUNT(*) FROM passwords"
+SQL_DELETE = "DELETE FROM passwords WHERE name=?"
+SQL_CLEAR = "DELETE FROM passwords"
+
 # ============================================================================
 # 工具函数
 # ============================================================================
 
-def safe_copy_to_clipboard(text):
-    """安全地复制文本到剪贴板，包含错误处理"""
-    try:
-        if CLIPBOARD_AVAILABLE:
-            pyperclip.copy(text)
-            return True
-        else:
-            # 备用方案：使用 macOS 的 pbcopy 命令
-            import subprocess
-            result = subprocess.run(['pbcopy'], input=text, text=True, capture_output=True)
-            if result.returncode == 0:
-                return True
-            else:
-                print(f"pbcopy 失败: {result.stderr.decode()}", file=sys.stderr)
-                return False
-    except Exception as e:
-        print(f"复制失败: {e}", file=sys.stderr)
-        # 最后的备用方案：直接输出到 stderr，用户可以手动复制
-        print(f"请手动复制: {text}", file=sys.stderr)
-        return False
+def write_bytes(data):
+    """将已编码的 JSON 字节（含结尾换行）一次性写入 stdout"""
+    out = sys.stdout.buffer
+    out.write(data)
+    out.flush()
+
+def write_json(data):
+    """将数据序列化为 JSON 并写入 stdout，返回写出的字节"""
+    if ORJSON_AVAILABLE:
+        # orjson 直接输出 UTF-8 字节，原生支持非 ASCII 字符，换行由序列化时一并追加
+        json_bytes = orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        json_bytes = (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+    write_bytes(json_bytes)
+    return json_bytes
 
 def alfred_output(items):
     """输出 Alfred 标准格式的 JSON"""
-    output = {"items": []}
-    for item in items:
-        if isinstance(item, tuple):
-            name, subtitle = item
-            alfred_item = {
-                "title": name or "",
-                "subtitle": subtitle or "",
-                "arg": name or "",
-                "autocomplete": name or "",
-                "valid": True
-            }
-        else:
-            name = item.get("title", "")
-            subtitle = item.get("subtitle", "")
-            
-            # 构建 Alfred 标准格式
-            alfred_item = {
-                "title": name or "",
-                "subtitle": subtitle or "",
-                "arg": item.get("arg", name) or "",
-                "autocomplete": item.get("autocomplete", name) or "",
-                "valid": item.get("valid", True)
+    # 同一次调用的条目类型一致，只判断一次，再用列表推导式构建
+    if items and isinstance(items[0], tuple):
+        alfred_items = [
+            {"title": name, "subtitle": subtitle, "arg": name, "autocomplete": name, "valid": True}
+            for name, subtitle in items
+        ]
+    else:
+        get = dict.get
+        alfred_items = [
+            {
+                "title": item["title"],
+                "subtitle": get(item, "subtitle", ""),
+                "arg": get(item, "arg", item["title"]),
+                "autocomplete": get(item, "autocomplete", item["title"]),
+                "valid": get(item, "valid", True)
             }
-        
-        output["items"].append(alfred_item)
+            for item in items
+        ]
+    output = {"items": alfred_items}
     
-    # 确保输出到 stdout，使用 json.dumps 格式化输出
-    # 不输出到 stderr，避免干扰 Alfred
+    # 确保输出到 stdout，不输出到 stderr，避免干扰 Alfred
     try:
-        json_output = json.dumps(output, ensure_ascii=False)
-        print(json_output, flush=True)
+        json_bytes = write_json(output)
     except Exception as e:
         # 如果 JSON 序列化失败，输出错误信息
         error_output = {
@@ -91,99 +114,188 @@ def alfred_output(items):
                 "valid": False
             }]
         }
-        print(json.dumps(error_output, ensure_ascii=False), flush=True)
+        write_json(error_output)
+        return
+    store_cached_output(json_bytes)
+
+def has_help_marker(query):
+    """查询中是否包含帮助项的 emoji 标记"""
+    return not HELP_EMOJI_MARKERS.isdisjoint(query) or HELP_WARNING_MARKER in query
+
+def has_emoji_marker(query):
+    """查询中是否包含帮助项或操作结果的 emoji 标记"""
+    return has_help_marker(query) or not RESULT_EMOJI_MARKERS.isdisjoint(query)
 
 # ============================================================================
 # 数据库操作
 # ============================================================================
 
-def init_db():
+def get_conn():
+    """获取数据库连接，整个进程复用同一个连接"""
+    global _CONN
+    if _CONN is None:
+        _CONN = sqlite3.connect(DB_PATH, isolation_level=None, check_same_thread=False)
+        # WAL 模式；保持默认的 FULL 同步级别，已提交的密码在断电后也不会丢失
+        _CONN.execute("PRAGMA journal_mode=WAL")
+        # 新数据库的 user_version 为 0；旧版本的数据库需要补建索引
+        if _CONN.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            init_db(_CONN)
+    return _CONN
+
+def close_conn():
+    """关闭数据库连接"""
+    global _CONN
+    if _CONN is not None:
+        _CONN.close()
+        _CONN = None
+
+atexit.register(close_conn)
+
+def init_db(conn=None):
     """初始化数据库"""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS passwords (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE,
-            password TEXT,
-            created_at TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
-
-def save_password(name, password):
+    conn = conn or get_conn()
+    conn.execute(SQL_CREATE)
+    conn.execute(SQL_CREATE_INDEX)
+    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+def save_password(name, password, conn=None):
     """保存密码"""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        "INSERT OR REPLACE INTO passwords (name, password, created_at) VALUES (?, ?, ?)",
-        (name, password, int(time.time()))
-    )
-    conn.commit()
-    conn.close()
+    conn = conn or get_conn()
+    invalidate_output_cache()
+    conn.execute(SQL_INSERT, (name, password, int(time.time())))
 
-def get_password(name):
+def get_password(name, conn=None):
     """获取密码"""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT password FROM passwords WHERE name=?", (name,))
-    row = c.fetchone()
-    conn.close()
+    conn = conn or get_conn()
+    row = conn.execute(SQL_SELECT_ONE, (name,)).fetchone()
     return row[0] if row else None
 
-def list_passwords():
-    """列出所有密码名称"""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT name FROM passwords ORDER BY created_at DESC")
-    rows = c.fetchall()
-    conn.close()
-    return [name for (name,) in rows]
+def list_passwords_full(conn=None):
+    """列出所有密码名称及密码，返回 [(name, password), ...]"""
+    conn = conn or get_conn()
+    return conn.execute(SQL_LIST_FULL).fetchall()
 
-def delete_password(name):
+def list_recent_passwords(limit, conn=None):
+    """列出最近保存的 limit 个密码名称及密码"""
+    conn = conn or get_conn()
+    return conn.execute(SQL_LIST_RECENT, (limit,)).fetchall()
+
+def count_passwords(conn=None):
+    """统计密码数量"""
+    conn = conn or get_conn()
+    return conn.execute(SQL_COUNT).fetchone()[0]
+
+def delete_password(name, conn=None):
     """删除密码"""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("DELETE FROM passwords WHERE name=?", (name,))
-    deleted_count = c.rowcount
-    conn.commit()
-    conn.close()
-    return deleted_count > 0
-
-def clear_all_passwords():
+    conn = conn or get_conn()
+    invalidate_output_cache()
+    c = conn.execute(SQL_DELETE, (name,))
+    return c.rowcount > 0
+
+def clear_all_passwords(conn=None):
     """清空所有密码"""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    # 先获取删除前的数量
-    c.execute("SELECT COUNT(*) FROM passwords")
-    count_before = c.fetchone()[0]
-    # 执行删除
-    c.execute("DELETE FROM passwords")
-    conn.commit()
-    conn.close()
-    return count_before
+    conn = conn or get_conn()
+    invalidate_output_cache()
+    # 单条 DELETE 在自动提交模式下本身是原子的，直接使用其 rowcount 作为删除数量
+    return conn.execute(SQL_CLEAR).rowcount
+
+# ============================================================================
+# 输出缓存
+# ============================================================================
+
+def get_wal_state():
+    """获取 WAL 文件的 (修改时间, 大小)，文件不存在时返回 None"""
+    try:
+        st = os.stat(DB_PATH + "-wal")
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def get_db_state():
+    """获取数据库文件状态，用作缓存校验，数据库不存在时返回 None"""
+    # WAL 模式下已提交的写入先落在 -wal 文件中，检查点之前主文件不会变化，
+    # 因此需要同时比较 -wal 文件的状态
+    try:
+        db_mtime = os.stat(DB_PATH).st_mtime_ns
+    except OSError:
+        return None
+    return (db_mtime, get_wal_state())
+
+def load_output_cache():
+    """读取输出缓存，缓存不存在或损坏时返回空字典"""
+    try:
+        with open(CACHE_PATH, "rb") as f:
+            cache = marshal.load(f)
+    except Exception:
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def get_cached_output(query, db_state):
+    """查询缓存的输出，数据库文件状态不一致时视为未命中"""
+    entry = load_output_cache().get(query)
+    # 格式不正确的条目视为未命中
+    if (isinstance(entry, tuple) and len(entry) == 2 and
+            entry[0] == db_state and isinstance(entry[1], bytes)):
+        return entry[1]
+    return None
+
+def store_cached_output(json_bytes):
+    """将本次输出写入缓存，失败时静默忽略（输出已经写出，缓存只是优化）"""
+    if _CACHE_KEY is None:
+        return
+    try:
+        query, db_state = _CACHE_KEY
+        cache = load_output_cache()
+        cache.pop(query, None)
+        cache[query] = (db_state, json_bytes)
+        # 超出容量时丢弃最早写入的条目
+        while len(cache) > CACHE_MAX_ENTRIES:
+            del cache[next(iter(cache))]
+        tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+        # 缓存中包含明文密码，仅允许当前用户读写
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "wb") as f:
+            marshal.dump(cache, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except Exception:
+        pass
+
+def invalidate_output_cache():
+    """数据有变更时清除输出缓存，并禁止缓存本次输出"""
+    global _CACHE_KEY
+    _CACHE_KEY = None
+    try:
+        os.remove(CACHE_PATH)
+    except OSError:
+        pass
 
 # ============================================================================
 # 密码生成
 # ============================================================================
 
 def generate_password(length=16):
-    """生成随机密码"""
-    chars = string.ascii_letters + string.digits + "!@#$%^&*()-_=+"
-    return ''.join(random.choice(chars) for _ in range(length))
+    """生成随机密码（使用 os.urandom 作为密码学安全的随机源）"""
+    # 只在生成密码时才需要，延迟导入以缩短搜索、列表等常用路径的启动时间
+    import string
+    chars = (string.ascii_letters + string.digits + "!@#$%^&*()-_=+").encode()
+    n = len(chars)
+    # 拒绝采样：丢弃 >= limit 的字节，保证每个字符等概率出现
+    limit = 256 - (256 % n)
+    result = b""
+    while len(result) < length:
+        result += bytes(chars[b % n] for b in os.urandom(length * 2) if b < limit)
+    return result[:length].decode()
 
 # ============================================================================
 # 命令处理函数
 # ============================================================================
 
-def handle_list_command():
-    """处理列表命令"""
-    rows = list_passwords()
+def handle_list_command(query_args=None):
+    """处理列表命令（query_args 仅为与其他命令处理函数签名一致，未使用）"""
+    rows = list_passwords_full()
     if rows:
         items = []
-        for name in rows:
-            pwd = get_password(name)
+        for name, pwd in rows:
             if pwd:
                 items.append({
                     "title": name,
@@ -207,7 +319,7 @@ def handle_clear_command(query):
     """处理清空命令"""
     if query.strip().lower() == "clear":
         # 获取当前密码数量
-        current_count = len(list_passwords())
+        current_count = count_passwords()
         if current_count > 0:
             alfred_output([("⚠️ 确认清空", f"输入 'clear confirm' 来确认清空所有密码（当前有 {current_count} 个密码）")])
         else:
@@ -215,16 +327,11 @@ def handle_clear_command(query):
     elif query.strip().lower() == "clear confirm":
         count = clear_all_passwords()
         if count > 0:
-            # 清空后，验证是否真的清空了
-            remaining = len(list_passwords())
-            if remaining == 0:
-                alfred_output([("✅ 清空完成", f"已成功删除 {count} 个密码记录")])
-            else:
-                alfred_output([("⚠️ 清空部分完成", f"已删除 {count} 个密码记录，但仍有 {remaining} 个密码未删除")])
+            alfred_output([("✅ 清空完成", f"已成功删除 {count} 个密码记录")])
         else:
             alfred_output([("清空完成", "没有密码记录需要删除")])
     else:
-        current_count = len(list_passwords())
+        current_count = count_passwords()
         if current_count > 0:
             alfred_output([("⚠️ 确认清空", f"输入 'clear confirm' 来确认清空所有密码（当前有 {current_count} 个密码）")])
         else:
@@ -298,32 +405,33 @@ def handle_query_password(query_args):
 
 def handle_smart_search(query):
     """处理智能搜索"""
-    all_passwords = list_passwords()
+    all_passwords = list_passwords_full()
+    query_lower = query.lower()
     
-    # 先检查是否有完全匹配的密码名称
+    # 单次遍历：遇到完全匹配的密码名称立即停止，否则收集模糊匹配结果
     exact_match = None
-    for name in all_passwords:
-        if name.lower() == query.lower():
-            exact_match = name
+    matching_passwords = []
+    for name, pwd in all_passwords:
+        name_lower = name.lower()
+        if name_lower == query_lower:
+            exact_match = (name, pwd)
             break
+        if query_lower in name_lower:
+            matching_passwords.append((name, pwd))
     
     if exact_match:
-        # 完全匹配，直接查询密码
-        pwd = get_password(exact_match)
+        # 完全匹配，直接使用已取出的密码
+        name, pwd = exact_match
         if pwd:
             # 在 Alfred 中，让 Alfred 负责复制，arg 字段包含密码即可
-            alfred_output([{"title": exact_match, "subtitle": f"点击复制密码: {pwd}", "arg": pwd}])
+            alfred_output([{"title": name, "subtitle": f"点击复制密码: {pwd}", "arg": pwd}])
         else:
             alfred_output([("未找到密码", "可用 '标签 密码' 保存新密码或 '长度 标签' 生成密码")])
         return
     
-    # 没有完全匹配，进行模糊搜索
-    matching_passwords = [name for name in all_passwords if query.lower() in name.lower()]
-    
     if matching_passwords:
         items = []
-        for name in matching_passwords:
-            pwd = get_password(name)
+        for name, pwd in matching_passwords:
             if pwd:
                 items.append({
                     "title": name,
@@ -346,7 +454,7 @@ def handle_smart_search(query):
 def show_help():
     """显示帮助信息"""
     # 获取当前密码数量
-    password_count = len(list_passwords())
+    password_count = count_passwords()
     
     help_items = [
         {
@@ -408,7 +516,6 @@ def show_help():
     
     # 如果有密码，添加快速访问选项
     if password_count > 0:
-        all_passwords = list_passwords()
         help_items.append({
             "title": "📋 快速访问",
             "subtitle": "点击查看所有保存的密码",
@@ -418,9 +525,8 @@ def show_help():
         })
         
         # 显示最近的几个密码 - 直接返回密码值
-        recent_passwords = all_passwords[:3]  # 显示最近3个
-        for name in recent_passwords:
-            pwd = get_password(name)
+        recent_passwords = list_recent_passwords(3)  # 显示最近3个
+        for name, pwd in recent_passwords:
             if pwd:
                 help_items.append({
                     "title": f"🔑 {name}",
@@ -439,18 +545,26 @@ def show_help():
     
     alfred_output(help_items)
 
+# 命令前缀分派表：(命令, 处理函数, 最短前缀长度)，支持前缀匹配，如 "lis"、"li" 可以匹配 "list"
+COMMAND_PREFIXES = [
+    ("list", handle_list_command, 2),
+    ("del", handle_delete_command, 3),
+    ("regen", handle_regen_command, 3),
+]
+# 展开为 {前缀: 处理函数}，运行时只需一次字典查找
+COMMAND_DISPATCH = {
+    command[:length]: handler
+    for command, handler, min_len in COMMAND_PREFIXES
+    for length in range(min_len, len(command) + 1)
+}
+
 # ============================================================================
 # 主程序
 # ============================================================================
 
 def main():
     """主程序入口"""
-    # 初始化数据库
-    try:
-        init_db()
-    except Exception as e:
-        alfred_output([("数据库错误", f"无法初始化数据库: {str(e)}")])
-        return
+    global _CACHE_KEY
     
     # 获取命令行参数
     # Alfred 可能传递空字符串、None 或特殊值
@@ -466,20 +580,18 @@ def main():
     
     # 将查询分割为参数数组
     query_args = query.split() if query else []
+    # 参数的小写形式只计算一次，供后续命令匹配复用
+    lowered_args = [arg.lower() for arg in query_args]
     
-    # 处理空查询
-    if not query or (isinstance(query, str) and query.isspace()):
-        show_help()
-        return
-    
-    # 处理系统消息（删除成功、清空完成等），直接显示帮助，避免被重新处理
-    system_messages = ["✅ 删除成功", "删除成功", "删除失败", "✅ 清空完成", "清空完成", "清空失败"]
-    if query.strip() in system_messages or query.strip().startswith("✅") or query.strip().startswith("❌"):
-        show_help()
-        return
+    # 空查询或系统消息（删除成功、清空完成等）直接显示帮助，避免被重新处理
+    is_empty = not query or (isinstance(query, str) and query.isspace())
+    is_system_message = not is_empty and (
+        query in SYSTEM_MESSAGES or query.startswith(("✅", "❌"))
+    )
     
+    # 以下输入中状态无需访问数据库，在打开连接之前返回
     # 处理输入长度检查
-    if len(query) < 2:
+    if not is_empty and not is_system_message and len(query) < 2:
         alfred_output([{"title": "输入中...", "subtitle": "继续输入以搜索或生成密码", "valid": False}])
         return
     
@@ -501,33 +613,43 @@ def main():
     # 只检查明显不完整的模式（1-2个字符的常见前缀）
     if (len(query_args) == 2 and 
         query_args[0].isdigit() and 
-        query_args[1].lower() in ['gi', 'g']):
+        lowered_args[1] in ['gi', 'g']):
         alfred_output([{"title": "输入中...", "subtitle": f"继续输入完整标签名，当前: {query_args[1]}", "valid": False}])
         return
     
+    # 相同查询且数据库未变更时，直接输出缓存的结果
+    db_state = get_db_state()
+    if db_state is not None:
+        cached = get_cached_output(query, db_state)
+        if cached is not None:
+            write_bytes(cached)
+            return
+    
+    # 打开数据库连接（首次使用时自动建表）
+    try:
+        get_conn()
+    except Exception as e:
+        alfred_output([("数据库错误", f"无法初始化数据库: {str(e)}")])
+        return
+    
+    if db_state is not None:
+        _CACHE_KEY = (query, db_state)
+    
+    if is_empty or is_system_message:
+        show_help()
+        return
+    
     # 检查特殊命令
-    is_special_command = any(cmd in [arg.lower() for arg in query_args] for cmd in ['list', 'clear', 'del', 'regen'])
+    is_special_command = not {'list', 'clear', 'del', 'regen'}.isdisjoint(lowered_args)
     is_number_start = query_args[0].isdigit() if query_args and len(query_args) > 0 else False
     
-    # 处理特殊命令
-    # 支持前缀匹配，如 "lis"、"li" 可以匹配 "list"
-    if query_args and len(query_args) > 0:
-        first_arg = query_args[0].lower()
-        # 检查是否是 list 命令（完全匹配或前缀匹配）
-        if first_arg == "list" or (len(first_arg) >= 2 and first_arg in ["li", "lis"]):
-            handle_list_command()
-            return
-        
-        if first_arg == "del":
-            handle_delete_command(query_args)
-            return
-        
-        # 检查是否是 regen 命令（完全匹配或前缀匹配）
-        if first_arg == "regen" or (len(first_arg) >= 3 and first_arg in ["reg", "rege"]):
-            handle_regen_command(query_args)
-            return
+    # 处理特殊命令（list、del、regen 按第一个参数查分派表）
+    handler = COMMAND_DISPATCH.get(lowered_args[0]) if lowered_args else None
+    if handler:
+        handler(query_args)
+        return
     
-    if query_args and "clear" in [arg.lower() for arg in query_args]:
+    if "clear" in lowered_args:
         handle_clear_command(query)
         return
     
@@ -539,14 +661,14 @@ def main():
     # 处理保存密码（非数字开头，多个参数）
     # 但排除包含 emoji 或特殊字符的情况（可能是帮助项或系统消息）
     if (len(query_args) >= 2 and not is_number_start and 
-        not any(char in query for char in ['🔐', '🔑', '📋', '⚠️', '✅', '❌'])):
+        not has_emoji_marker(query)):
         handle_save_password(query_args)
         return
     
     # 智能搜索（单个参数，非特殊命令，非数字开头）
     if not is_special_command and not is_number_start and len(query_args) == 1:
         # 如果包含 emoji，可能是帮助项，直接显示帮助
-        if any(char in query for char in ['🔐', '🔑', '📋', '⚠️']):
+        if has_help_marker(query):
             show_help()
             return
         handle_smart_search(query)
@@ -555,7 +677,7 @@ def main():
     # 默认查询密码
     if query_args and len(query_args) > 0:
         # 如果包含 emoji，可能是帮助项或系统消息，直接显示帮助
-        if any(char in query for char in ['🔐', '🔑', '📋', '⚠️', '✅', '❌']):
+        if has_emoji_marker(query):
             show_help()
             return
         handle_query_password(query_args)
@@ -0,0 +1,146 @@
+import json
+import marshal
+import os
+import runpy
+import shutil
+import sqlite3
+import string
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "pass.py"
+
+
+@pytest.fixture
+def script(tmp_path):
+    """复制脚本到临时目录，使数据库和缓存文件都落在该目录下"""
+    path = tmp_path / "pass.py"
+    shutil.copy(SCRIPT, path)
+    return path
+
+
+def run(script, query):
+    result = subprocess.run(
+        [sys.executable, str(script), query],
+        capture_output=True, check=True
+    )
+    return json.loads(result.stdout)["items"]
+
+
+def test_cache_sees_writes_while_another_connection_is_open(script):
+    db_path = script.parent / "passwords.db"
+    run(script, "github oldpw")
+    assert run(script, "github")[0]["arg"] == "oldpw"
+    # 再次查询命中输出缓存
+    assert run(script, "github")[0]["arg"] == "oldpw"
+    assert (script.parent / "passwords.db.cache").exists()
+
+    # 保持一个连接打开，阻止 WAL 在连接关闭时被检查点写回主文件
+    holder = sqlite3.connect(db_path)
+    try:
+        holder.execute("SELECT COUNT(*) FROM passwords").fetchone()
+        writer = sqlite3.connect(db_path)
+        writer.execute("UPDATE passwords SET password=? WHERE name=?", ("newpw", "github"))
+        writer.commit()
+        writer.close()
+
+        assert run(script, "github")[0]["arg"] == "newpw"
+    finally:
+        holder.close()
+
+
+@pytest.mark.parametrize("bad_cache", [[1, 2], {"github": 5}, {"github": (1,)}])
+def test_malformed_cache_is_treated_as_empty(script, bad_cache):
+    run(script, "github oldpw")
+    with open(script.parent / "passwords.db.cache", "wb") as f:
+        marshal.dump(bad_cache, f)
+    assert run(script, "github")[0]["arg"] == "oldpw"
+    assert run(script, "list")[0]["arg"] == "oldpw"
+
+
+def test_cache_write_failure_does_not_emit_second_document(script):
+    run(script, "github oldpw")
+    # 缓存路径被目录占用，写缓存必然失败
+    (script.parent / "passwords.db.cache").mkdir()
+    # run() 用 json.loads 解析整个 stdout，多输出一个 JSON 文档会解析失败
+    assert run(script, "github")[0]["arg"] == "oldpw"
+
+
+def test_cache_file_is_private(script):
+    run(script, "github oldpw")
+    run(script, "github")
+    mode = (script.parent / "passwords.db.cache").stat().st_mode & 0o777
+    assert mode == 0o600
+
+
+def cached_queries(script):
+    with open(script.parent / "passwords.db.cache", "rb") as f:
+        return set(marshal.load(f))
+
+
+def test_read_after_save_returns_new_password(script):
+    run(script, "github oldpw")
+    assert run(script, "github")[0]["arg"] == "oldpw"
+    assert "github" in cached_queries(script)
+    run(script, "github newpw")
+    assert run(script, "github")[0]["arg"] == "newpw"
+
+
+def test_read_after_regen_returns_new_password(script):
+    run(script, "github oldpw")
+    assert run(script, "github")[0]["arg"] == "oldpw"
+    new_pwd = run(script, "regen github")[0]["arg"]
+    assert new_pwd != "oldpw"
+    assert run(script, "github")[0]["arg"] == new_pwd
+
+
+@pytest.mark.parametrize("command", ["del github", "clear confirm"])
+def test_delete_commands_remove_cache_file(script, command):
+    run(script, "github oldpw")
+    run(script, "github")
+    assert (script.parent / "passwords.db.cache").exists()
+    run(script, command)
+    assert not (script.parent / "passwords.db.cache").exists()
+
+
+def test_write_command_output_is_never_cached(script):
+    run(script, "github oldpw")
+    run(script, "list")
+    first = run(script, "16 gitlab")[0]["arg"]
+    second = run(script, "16 gitlab")[0]["arg"]
+    assert first != second
+    run(script, "list")
+    assert "16 gitlab" not in cached_queries(script)
+    assert "list" in cached_queries(script)
+
+
+@pytest.fixture
+def generate_password():
+    return runpy.run_path(str(SCRIPT))["generate_password"]
+
+
+ALPHABET = string.ascii_letters + string.digits + "!@#$%^&*()-_=+"
+
+
+@pytest.mark.parametrize("length", [0, 1, 16, 1000])
+def test_generate_password_length_and_alphabet(generate_password, length):
+    assert len(ALPHABET) == 76
+    pwd = generate_password(length)
+    assert len(pwd) == length
+    assert set(pwd) <= set(ALPHABET)
+
+
+def test_generate_password_rejects_bytes_at_or_above_limit(generate_password, monkeypatch):
+    limit = 256 - 256 % len(ALPHABET)
+    assert limit == 228
+    # 第一次只给出应被拒绝的字节，第二次混合给出，检查只有 < 228 的字节被映射
+    draws = iter([
+        bytes(range(limit, 256)),
+        bytes([0, 255, 75, 228, 76, 227, 151, 240]),
+    ])
+    monkeypatch.setattr(os, "urandom", lambda n: next(draws))
+    expected = "".join(ALPHABET[b % 76] for b in [0, 75, 76, 227])
+    assert generate_password(4) == expected